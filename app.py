@@ -1,1026 +1,917 @@
-import streamlit as st
-import pandas as pd
-import requests
-import re
-import time
-import hashlib
-from bs4 import BeautifulSoup
-from io import BytesIO
-from unidecode import unidecode
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment
-from openpyxl.worksheet.table import Table, TableStyleInfo
-from openpyxl.utils import get_column_letter
-
-# -------------------------------------------------
-# CONFIG
-# -------------------------------------------------
-HEADERS = {"User-Agent": "Mozilla/5.0"}
-REQUEST_DELAY = 0.15  # Google Maps throttle
-
-try:
-    GOOGLE_MAPS_API_KEY = st.secrets.get("GOOGLE_MAPS_API_KEY", "")
-except:
-    GOOGLE_MAPS_API_KEY = ""
-
-SHORT_FORMS = {
-    "RD": "ROAD", "ST": "STREET", "AVE": "AVENUE",
-    "BLVD": "BOULEVARD", "DR": "DRIVE",
-    "LN": "LANE", "PL": "PLACE"
-}
-
-STANDARD_COUNTRIES = {
-    "USA": "UNITED STATES OF AMERICA",
-    "US": "UNITED STATES OF AMERICA",
-    "UNITED STATES": "UNITED STATES OF AMERICA",
-    "UK": "UNITED KINGDOM OF GREAT BRITAIN AND NORTHERN IRELAND",
-    "UNITED KINGDOM": "UNITED KINGDOM OF GREAT BRITAIN AND NORTHERN IRELAND"
-}
-
-# -------------------------------------------------
-# HELPERS
-# -------------------------------------------------
-def normalize_text(text: str) -> str:
-    text = unidecode(text).upper()
-    text = re.sub(r"[^\w\s]", "", text)
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
-
-def hash_address(addr: dict) -> str:
-    key = "|".join([
-        addr.get("STREET ADDRESS 1", ""),
-        addr.get("CITY", ""),
-        addr.get("STATE", ""),
-        addr.get("PIN CODE", ""),
-        addr.get("COUNTRY", "")
-    ])
-    return hashlib.md5(key.encode()).hexdigest()
-
-def standardize_address(raw: str) -> str:
-    """Lightweight top-level standardizer returning primary street line.
-
-    This keeps compatibility with older UI code that expects a string.
-    """
-    if not raw:
-        return ""
-    raw_norm = normalize_text(raw)
-    for k, v in SHORT_FORMS.items():
-        raw_norm = re.sub(rf"\b{k}\b", v, raw_norm, flags=re.I)
-    parts = [p.strip() for p in re.split(r",|;|\n", raw_norm) if p.strip()]
-    return parts[0] if parts else raw_norm
-
-def enrich_google_maps(rec: dict) -> dict:
-    """Placeholder enrichment wrapper used by the UI.
-
-    If you want Google enrichment later, extend this to call the Geocoding API.
-    For now it returns the record unchanged to avoid NameError.
-    """
-    return rec
-
-
-# -------------------------------
-# Dict-style extraction + standardization (top-level)
-# -------------------------------
-def ensure_scheme(url: str) -> str:
-    if not url:
-        return ""
-    url = url.strip()
-    if not url.startswith("http"):
-        return "https://" + url.lstrip("/")
-    return url
-
-
-STREET_KEYWORDS = r"\b(STREET|ST\.|ROAD|RD\.|AVE|AVENUE|BOULEVARD|BLVD|DR|DRIVE|LANE|LN|WAY|TERRACE|PLAZA|PL|COURT|CT)\b"
-EXCLUDE_SALES_KEYWORDS = [
-    "store", "stores", "location", "locations", "dealer", "retail",
-    "shop", "franchise", "outlet", "distributor", "sales"
-]
-
-# Pages and keywords we should prioritize when hunting for corporate addresses
-PREFERRED_PAGE_KEYWORDS = [
-    "contact", "contact-us", "contactus", "about", "about-us", "aboutus",
-    "head", "head-office", "headquarters", "hq", "office", "offices",
-    "locations", "location", "plant", "plants", "manufacturing", "factory", "site", "facility"
-]
-
-CANDIDATE_PATHS = [
-    "/contact", "/contact-us", "/about", "/about-us", "/locations",
-    "/location", "/offices", "/head-office", "/headquarters", "/hq",
-    "/plants", "/manufacturing", "/factory", "/site", "/facility"
-]
-
-
-def find_pages_from_home(home_url: str, max_pages=10):
-    home = ensure_scheme(home_url)
-    pages = [home]
-    try:
-        r = requests.get(home, headers=HEADERS, timeout=6)
-        soup = BeautifulSoup(r.text, "html.parser")
-        for a in soup.find_all("a", href=True):
-            href = a["href"].strip()
-            if href.startswith("/"):
-                pages.append(home.rstrip("/") + href)
-            elif href.startswith("http"):
-                pages.append(href)
-            if len(set(pages)) >= max_pages:
-                break
-    except Exception:
-        pass
-
-    base = re.sub(r"/+$", "", home)
-    # add preferred candidate paths first
-    for p in CANDIDATE_PATHS:
-        pages.append(base + p)
-
-    # dedupe and prioritize pages whose path contains preferred keywords
-    ordered = []
-    seen = set()
-    # First, add pages that match preferred keywords
-    for p in pages:
-        lp = p.lower()
-        if any(k in lp for k in PREFERRED_PAGE_KEYWORDS):
-            if p not in seen:
-                ordered.append(p)
-                seen.add(p)
-    # Then add the rest preserving order
-    for p in pages:
-        if p not in seen:
-            ordered.append(p)
-            seen.add(p)
-
-    return ordered[:max_pages]
-
-
-def extract_address_site(website: str, prefer_hq: bool = True):
-    """Return (raw_address, found_page) or ("", "").
-
-    If `prefer_hq` is True, pages or sections that look like retail/store locations
-    will be deprioritized or skipped.
-    """
-    if not website:
-        return "", ""
-    domain = re.sub(r"https?://", "", website).split("/", 1)[0]
-    pages = find_pages_from_home(website, max_pages=12)
-
-    visited = set()
-    # Depth-first crawl (pages + one-level internal links)
-    for p in pages:
-        try:
-            if p in visited:
-                continue
-            visited.add(p)
-            r = requests.get(ensure_scheme(p), headers=HEADERS, timeout=6)
-            soup = BeautifulSoup(r.text, "html.parser")
-            addr_tag = soup.find("address")
-            if addr_tag:
-                txt = addr_tag.get_text(" ", strip=True)
-                if txt:
-                    # prefer corporate pages: boost pages with 'contact'/'about' or 'head office'
-                    txt_low = txt.lower()
-                    if prefer_hq and any(k in txt_low for k in EXCLUDE_SALES_KEYWORDS):
-                        # skip sales pages if preferring HQ
-                        pass
-                    else:
-                        return normalize_text(txt), ensure_scheme(p)
-
-            text = soup.get_text(" ", strip=True)
-            # search for strict address candidates
-            for line in text.splitlines():
-                if len(line) < 10:
-                    continue
-                cand = line.strip()
-                if is_strict_address_candidate(cand):
-                    cand_low = cand.lower()
-                    if prefer_hq and any(k in cand_low for k in EXCLUDE_SALES_KEYWORDS):
-                        # deprioritize store/location blocks
-                        continue
-                    return normalize_text(cand), ensure_scheme(p)
-            # if not found on this page, collect internal links for one more depth
-            internal_links = []
-            for a in soup.find_all("a", href=True):
-                href = a["href"].strip()
-                if href.startswith("/"):
-                    internal_links.append(ensure_scheme(domain + href))
-                elif href.startswith("http") and domain in href:
-                    internal_links.append(href)
-            # crawl one level of internal links
-            for link in internal_links[:6]:
-                if link in visited:
-                    continue
-                visited.add(link)
-                try:
-                    r2 = requests.get(link, headers=HEADERS, timeout=6)
-                    txt2 = BeautifulSoup(r2.text, "html.parser").get_text(" ", strip=True)
-                    for line in txt2.splitlines():
-                        if is_strict_address_candidate(line):
-                            cand_low = line.lower()
-                            if prefer_hq and any(k in cand_low for k in EXCLUDE_SALES_KEYWORDS):
-                                continue
-                            return normalize_text(line), link
-                except Exception:
-                    continue
-        except Exception:
-            continue
-
-    # fallback: try duckduckgo-lite search
-    try:
-        url = "https://html.duckduckgo.com/html/"
-        # broaden search terms to prefer contact/location/headquarter/manufacturing pages
-        query_terms = "contact OR contact us OR locations OR headquarters OR head office OR plant OR manufacturing OR office"
-        q = f"site:{domain} {query_terms}"
-        res = requests.post(url, data={"q": q}, headers=HEADERS, timeout=6)
-        soup = BeautifulSoup(res.text, "html.parser")
-        links = []
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
-            if href.startswith("http") and domain in href:
-                links.append(href)
-            if len(links) >= 6:
-                break
-        for link in links:
-            try:
-                r = requests.get(link, headers=HEADERS, timeout=6)
-                txt = BeautifulSoup(r.text, "html.parser").get_text(" ", strip=True)
-                for line in txt.splitlines():
-                    if is_strict_address_candidate(line):
-                        cand_low = line.lower()
-                        if prefer_hq and any(k in cand_low for k in EXCLUDE_SALES_KEYWORDS):
-                            continue
-                        return normalize_text(line), link
-            except Exception:
-                continue
-    except Exception:
-        pass
-
-    return "", ""
-
-
-def extract_all_addresses_site(website: str, limit: int = 20):
-    """Return list of (raw_address, found_page) found across the site (breadth-first).
-
-    This is used when the user wants multiple facility/store locations for a company.
-    """
-    out = []
-    if not website:
-        return out
-    domain = re.sub(r"https?://", "", website).split("/", 1)[0]
-    pages = find_pages_from_home(website, max_pages=30)
-    visited = set()
-
-    def collect_from_text(text, page):
-        for line in text.splitlines():
-            cand = line.strip()
-            if not cand:
-                continue
-            if is_strict_address_candidate(cand):
-                norm = normalize_text(cand)
-                if norm and all(norm != e[0] for e in out):
-                    out.append((norm, page))
-                    if len(out) >= limit:
-                        return True
-        return False
-
-    # scan listed pages and one-level internal links
-    for p in pages:
-        if p in visited:
-            continue
-        visited.add(p)
-        try:
-            r = requests.get(ensure_scheme(p), headers=HEADERS, timeout=6)
-            soup = BeautifulSoup(r.text, "html.parser")
-            # address tags
-            for tag in soup.find_all("address"):
-                txt = tag.get_text(" ", strip=True)
-                if txt and collect_from_text(txt, ensure_scheme(p)):
-                    return out
-
-            text = soup.get_text(" ", strip=True)
-            if collect_from_text(text, ensure_scheme(p)):
-                return out
-
-            # gather internal links to scan shallowly
-            links = []
-            for a in soup.find_all("a", href=True):
-                href = a["href"].strip()
-                if href.startswith("/"):
-                    links.append(ensure_scheme(domain + href))
-                elif href.startswith("http") and domain in href:
-                    links.append(href)
-            for link in links[:10]:
-                if link in visited:
-                    continue
-                visited.add(link)
-                try:
-                    r2 = requests.get(link, headers=HEADERS, timeout=6)
-                    txt2 = BeautifulSoup(r2.text, "html.parser").get_text(" ", strip=True)
-                    if collect_from_text(txt2, link):
-                        return out
-                except Exception:
-                    continue
-        except Exception:
-            continue
-
-    # fallback DDG
-    try:
-        url = "https://html.duckduckgo.com/html/"
-        q = f"site:{domain} contact address"
-        res = requests.post(url, data={"q": q}, headers=HEADERS, timeout=6)
-        soup = BeautifulSoup(res.text, "html.parser")
-        links = []
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
-            if href.startswith("http") and domain in href:
-                links.append(href)
-            if len(links) >= 20:
-                break
-        for link in links:
-            try:
-                r = requests.get(link, headers=HEADERS, timeout=6)
-                txt = BeautifulSoup(r.text, "html.parser").get_text(" ", strip=True)
-                if collect_from_text(txt, link):
-                    return out
-            except Exception:
-                continue
-    except Exception:
-        pass
-
-    return out
-
-
-def is_strict_address_candidate(text: str) -> bool:
-    """Return True if text looks like a physical postal address.
-
-    Heuristics: must contain a street number OR a postal code, and a street keyword
-    (street type) OR common postal code pattern. This avoids grabbing hero text.
-    """
-    if not text or len(text.strip()) < 10:
-        return False
-    t = text.strip()
-    # must have a street number or postal code
-    has_number = bool(re.search(r"\d{1,5}", t))
-    has_postal = bool(re.search(r"\b\d{5}(?:-\d{4})?\b", t)) or bool(re.search(r"\b[A-Z]{1,2}\d[A-Z\d]?\s*\d[A-Z]{2}\b", t, re.I))
-    has_street = bool(re.search(STREET_KEYWORDS, t, re.I))
-
-    # require (number and street) OR postal
-    if (has_number and has_street) or has_postal:
-        # also avoid lines that are too long and look like paragraphs
-        if len(t) > 300:
-            return False
-        # avoid contact emails or long marketing lines
-        if "@" in t or t.lower().startswith("news") or t.lower().startswith("data"):
-            return False
-        return True
-    return False
-
-
-def standardize_address_dict(raw: str) -> dict:
-    out = {
-        "STREET ADDRESS 1": "",
-        "STREET ADDRESS 2": "",
-        "CITY": "",
-        "STATE": "",
-        "PIN CODE": "",
-        "COUNTRY": "",
-    }
-    if not raw:
-        return out
-    r = normalize_text(raw)
-    for k, v in SHORT_FORMS.items():
-        r = re.sub(rf"\b{k}\b", v, r, flags=re.I)
-
-    parts = [p.strip() for p in re.split(r",|;|\n", r) if p.strip()]
-    if parts:
-        out["STREET ADDRESS 1"] = parts[0]
-    if len(parts) >= 2:
-        last = parts[-1]
-        m = re.search(r"(\d{5}(?:-\d{4})?)", last)
-        if m:
-            out["PIN CODE"] = m.group(1)
-            last = last.replace(m.group(1), "").strip()
-        tokens = [t.strip() for t in last.split() if t.strip()]
-        if tokens:
-            if len(tokens) == 1 and len(tokens[0]) <= 3:
-                out["STATE"] = tokens[0]
-            else:
-                out["COUNTRY"] = tokens[-1]
-    if len(parts) >= 3:
-        out["CITY"] = parts[-2]
-
-    return out
-
-
-def enrich_with_nominatim(record: dict) -> dict:
-    q = ", ".join([record.get("STREET ADDRESS 1", ""), record.get("CITY", ""), record.get("STATE", ""), record.get("COUNTRY", "")])
-    q = q.strip().strip(',')
-    if not q:
-        return record
-    try:
-        url = "https://nominatim.openstreetmap.org/search"
-        res = requests.get(url, params={"q": q, "format": "json", "addressdetails": 1, "limit": 1}, headers={**HEADERS, "User-Agent": "SiteIntel/1.0 (mailto:you@example.com)"}, timeout=10)
-        data = res.json()
-        if data:
-            addr = data[0].get("address", {})
-            if not record.get("CITY") and addr.get("city"):
-                record["CITY"] = addr.get("city").upper()
-            if not record.get("STATE") and addr.get("state"):
-                record["STATE"] = addr.get("state").upper()
-            if not record.get("PIN CODE") and addr.get("postcode"):
-                record["PIN CODE"] = addr.get("postcode")
-            if not record.get("COUNTRY") and addr.get("country"):
-                record["COUNTRY"] = addr.get("country").upper()
-            time.sleep(1)
-    except Exception:
-        pass
-    return record
-
-# -------------------------------------------------
-# ADDRESS EXTRACTION
-# -------------------------------------------------
-def extract_address(website: str) -> str:
-    try:
-        if not website.startswith("http"):
-            website = "https://" + website
-
-        res = requests.get(website, headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        tag = soup.find("address")
-        if tag:
-            import streamlit as st
-            import pandas as pd
-            import requests
-            import re
-            import time
-            import hashlib
-            from bs4 import BeautifulSoup
-            from io import BytesIO
-            from unidecode import unidecode
-            from openpyxl import Workbook
-            from openpyxl.styles import Font, Alignment
-            from openpyxl.worksheet.table import Table, TableStyleInfo
-            from openpyxl.utils import get_column_letter
-
-            # -------------------------------------------------
-            # CONFIG
-            # -------------------------------------------------
-            HEADERS = {"User-Agent": "Mozilla/5.0"}
-            REQUEST_DELAY = 0.15
-            CRAWL_TIMEOUT = 6
-
-            SHORT_FORMS = {
-                "RD": "ROAD", "ST": "STREET", "AVE": "AVENUE",
-                "BLVD": "BOULEVARD", "DR": "DRIVE", "LN": "LANE", "PL": "PLACE"
-            }
-
-            STANDARD_COUNTRIES = {
-                "USA": "UNITED STATES OF AMERICA",
-                "US": "UNITED STATES OF AMERICA",
-            }
-
-            STREET_KEYWORDS = r"\b(STREET|ST\.|ROAD|RD\.|AVE|AVENUE|BOULEVARD|BLVD|DR|DRIVE|LANE|LN|WAY|TERRACE|PLAZA|PL|COURT|CT)\b"
-
-            # -------------------------------------------------
-            # UTILITIES
-            # -------------------------------------------------
-            def ensure_scheme(url: str) -> str:
-                if not url.startswith("http"):
-                    return "https://" + url.lstrip("/")
-                return url
-
-            def normalize_text(text: str) -> str:
-                if not text:
-                    return ""
-                text = unidecode(text).strip()
-                return re.sub(r"\s+", " ", text)
-
-            def hash_address(addr: dict) -> str:
-                key = "|".join([addr.get(k, "") for k in ["STREET ADDRESS 1", "CITY", "STATE", "PIN CODE", "COUNTRY"]])
-                return hashlib.md5(key.encode()).hexdigest()
-
-            # -------------------------------------------------
-            # PAGE SEARCH & EXTRACTION
-            # -------------------------------------------------
-            def candidate_paths():
-                return ["/contact", "/contact-us", "/about", "/about-us", "/locations", "/location", "/contactus", "/company/contact"]
-
-            def find_pages_from_home(home_url: str, max_pages=10):
-                home = ensure_scheme(home_url)
-                pages = [home]
-                try:
-                    r = requests.get(home, headers=HEADERS, timeout=CRAWL_TIMEOUT)
-                    soup = BeautifulSoup(r.text, "html.parser")
-                    for a in soup.find_all("a", href=True):
-                        href = a["href"]
-                        if href.startswith("/"):
-                            pages.append(home.rstrip("/") + href)
-                        elif href.startswith(home) or href.startswith("http") and home in href:
-                            pages.append(href)
-                        if len(set(pages)) >= max_pages:
-                            break
-                except Exception:
-                    pass
-
-                # add common paths
-                base = re.sub(r"/+$", "", home)
-                for p in candidate_paths():
-                    pages.append(base + p)
-
-                # dedupe
-                out = []
-                for p in pages:
-                    if p not in out:
-                        out.append(p)
-                return out[:max_pages]
-
-            def ddg_site_search(domain: str, query_terms="contact address", max_results=5):
-                # Use DuckDuckGo HTML to search site pages for contact/address clues
-                q = f"site:{domain} {query_terms}"
-                try:
-                    url = "https://html.duckduckgo.com/html/"
-                    res = requests.post(url, data={"q": q}, headers=HEADERS, timeout=CRAWL_TIMEOUT)
-                    soup = BeautifulSoup(res.text, "html.parser")
-                    links = []
-                    for a in soup.find_all("a", href=True):
-                        href = a["href"]
-                        if href.startswith("http") and domain in href:
-                            links.append(href)
-                        if len(links) >= max_results:
-                            break
-                    return links
-                except Exception:
-                    return []
-
-            def find_address_in_html(text: str):
-                if not text:
-                    return None
-                # Search for an address-like block using keywords and number patterns
-                for line in text.splitlines():
-                    line = line.strip()
-                    if len(line) < 10:
-                        continue
-                    if re.search(STREET_KEYWORDS, line, re.I) and re.search(r"\d{1,5}", line):
-                        return normalize_text(line)
-                # fallback: search paragraphs
-                m = re.search(r"([\w\s,.-]{10,150}" + STREET_KEYWORDS + r"[\w\s,.-]{0,150})", text, re.I)
-                if m:
-                    return normalize_text(m.group(0))
-                return None
-
-            def extract_address(website: str):
-                # returns (raw_address_text, found_page_url)
-                if not website:
-                    return "", ""
-                domain = re.sub(r"https?://", "", website).split("/", 1)[0]
-                pages = find_pages_from_home(website, max_pages=12)
-
-                # Try pages from site
-                for p in pages:
-                    try:
-                        r = requests.get(ensure_scheme(p), headers=HEADERS, timeout=CRAWL_TIMEOUT)
-                        soup = BeautifulSoup(r.text, "html.parser")
-                        # check <address>
-                        addr_tag = soup.find("address")
-                        if addr_tag:
-                            txt = addr_tag.get_text(" ", strip=True)
-                            found = find_address_in_html(txt)
-                            if found:
-                                return found, ensure_scheme(p)
-
-                        # check footer and contact sections
-                        for selector in ["footer", "p", "div", "section"]:
-                            for el in soup.find_all(selector):
-                                txt = el.get_text(" ", strip=True)
-                                if re.search(STREET_KEYWORDS, txt, re.I) and re.search(r"\d{1,5}", txt):
-                                    return normalize_text(txt), ensure_scheme(p)
-                    except Exception:
-                        continue
-
-                # If not found, try DDG site search for likely pages
-                ddg_links = ddg_site_search(domain, query_terms="contact address", max_results=6)
-                for link in ddg_links:
-                    try:
-                        r = requests.get(link, headers=HEADERS, timeout=CRAWL_TIMEOUT)
-                        soup = BeautifulSoup(r.text, "html.parser")
-                        txt = soup.get_text(" ", strip=True)
-                        found = find_address_in_html(txt)
-                        if found:
-                            return found, link
-                    except Exception:
-                        continue
-
-                return "", ""
-
-            # -------------------------------------------------
-            # PARSING / STANDARDIZATION
-            # -------------------------------------------------
-            def standardize_address(raw: str) -> dict:
-                # parse raw address into components heuristically
-                out = {
-                    "STREET ADDRESS 1": "",
-                    "STREET ADDRESS 2": "",
-                    "CITY": "",
-                    "STATE": "",
-                    "PIN CODE": "",
-                    "COUNTRY": "",
-                }
-                if not raw:
-                    return out
-                raw = normalize_text(raw)
-                # replace short forms
-                for k, v in SHORT_FORMS.items():
-                    raw = re.sub(rf"\b{k}\b", v, raw, flags=re.I)
-
-                # split by commas
-                parts = [p.strip() for p in re.split(r",|;|\n", raw) if p.strip()]
-                if parts:
-                    out["STREET ADDRESS 1"] = parts[0]
-                if len(parts) >= 2:
-                    # try to assign city/state/pin from the last part
-                    last = parts[-1]
-                    # postal code
-                    m = re.search(r"(\d{5}(?:-\d{4})?)", last)
-                    if m:
-                        out["PIN CODE"] = m.group(1)
-                        last = last.replace(m.group(1), "").strip()
-                    # state (2-letter) or full
-                    tokens = [t.strip() for t in last.split() if t.strip()]
-                    if tokens:
-                        if len(tokens) == 1 and len(tokens[0]) <= 3:
-                            out["STATE"] = tokens[0]
-                        else:
-                            out["COUNTRY"] = tokens[-1]
-
-                # try to extract city from middle part
-                if len(parts) >= 3:
-                    out["CITY"] = parts[-2]
-
-                return out
-
-            # -------------------------------------------------
-            # FREE NOMINATIM ENRICHMENT (optional, free)
-            # -------------------------------------------------
-            def enrich_with_nominatim(record: dict) -> dict:
-                # Only call when we have at least street or city
-                q = ", ".join([record.get("STREET ADDRESS 1", ""), record.get("CITY", ""), record.get("STATE", ""), record.get("COUNTRY", "")])
-                q = q.strip().strip(",")
-                if not q:
-                    return record
-                try:
-                    url = "https://nominatim.openstreetmap.org/search"
-                    res = requests.get(url, params={"q": q, "format": "json", "addressdetails": 1, "limit": 1}, headers={**HEADERS, "User-Agent": "SiteIntel/1.0 (mailto:you@example.com)"}, timeout=10)
-                    data = res.json()
-                    if data:
-                        addr = data[0].get("address", {})
-                        if not record.get("CITY") and addr.get("city"):
-                            record["CITY"] = addr.get("city").upper()
-                        if not record.get("STATE") and addr.get("state"):
-                            record["STATE"] = addr.get("state").upper()
-                        if not record.get("PIN CODE") and addr.get("postcode"):
-                            record["PIN CODE"] = addr.get("postcode")
-                        if not record.get("COUNTRY") and addr.get("country"):
-                            record["COUNTRY"] = addr.get("country").upper()
-                        time.sleep(1)
-                except Exception:
-                    pass
-                return record
-
-            # -------------------------------------------------
-            # CONFIDENCE SCORE
-            # -------------------------------------------------
-            def calculate_confidence(addr: dict) -> int:
-                score = 0
-                if addr.get("STREET ADDRESS 1"):
-                    score += 40
-                if addr.get("CITY"):
-                    score += 15
-                if addr.get("STATE"):
-                    score += 15
-                if addr.get("PIN CODE"):
-                    score += 15
-                if addr.get("COUNTRY"):
-                    score += 15
-                return min(score, 100)
-
-            # -------------------------------------------------
-            # EXCEL EXPORT
-            # -------------------------------------------------
-            def generate_excel(data: list) -> bytes:
-                wb = Workbook()
-                ws = wb.active
-                ws.title = "SiteIntel Output"
-
-                ws.merge_cells("A1:K1")
-                ws["A1"] = "SiteIntel – By Kishor"
-                ws["A1"].font = Font(size=16, bold=True)
-                ws["A1"].alignment = Alignment(horizontal="center")
-
-                headers = [
-                    "STREET ADDRESS 1", "STREET ADDRESS 2",
-                    "CITY", "STATE", "PIN CODE", "COUNTRY",
-                    "CONFIDENCE SCORE", "DUPLICATE FLAG",
-                    "MASTER RECORD ID", "DATA SOURCE LINK", "FOUND PAGE"
-                ]
-
-                ws.append(headers)
-                for c in ws[2]:
-                    c.font = Font(bold=True)
-
-                for r in data:
-                    ws.append([r.get(h, "") for h in headers])
-
-                ref = f"A2:K{len(data)+2}"
-                table = Table(displayName="AddressTable", ref=ref)
-                table.tableStyleInfo = TableStyleInfo(name="TableStyleMedium9", showRowStripes=True)
-                ws.add_table(table)
-
-                for col in range(1, len(headers)+1):
-                    ws.column_dimensions[get_column_letter(col)].width = 25
-
-                ws.freeze_panes = "A3"
-                out = BytesIO()
-                wb.save(out)
-                return out.getvalue()
-
-            # -------------------------------------------------
-            # STREAMLIT UI
-            # -------------------------------------------------
-            st.set_page_config(page_title="SiteIntel – By Kishor", layout="wide", page_icon="📍")
-            st.markdown("""
-            <div style='display:flex;align-items:center;gap:12px'>
-              <div style='font-size:36px'>📍</div>
-              <div>
-                <h1 style='margin:0'>SiteIntel</h1>
-                <div style='color:gray'>Enterprise Address Intelligence — Semi-Agentic (free sources)</div>
-              </div>
-            </div>
-            """, unsafe_allow_html=True)
-
-            mode = st.radio("Mode", ["Batch (Excel upload)", "Single Company"])
-
-            if mode == "Batch (Excel upload)":
-                uploaded = st.file_uploader("Upload Excel with company websites", type=["xlsx", "xls"])
-                if st.button("🚀 Process Batch"):
-                    if not uploaded:
-                        st.warning("Upload a file first.")
-                        st.stop()
-
-                    df = pd.read_excel(uploaded)
-
-                    # reuse the website column finder
-                    def find_website_column(df: pd.DataFrame):
-                        for c in df.columns:
-                            if re.search(r"web|site|url", str(c), re.I):
-                                return c
-                        for c in df.columns:
-                            try:
-                                s = df[c].astype(str).str.strip().fillna("")
-                            except Exception:
-                                continue
-                            if s.str.startswith("http").any():
-                                return c
-                        for c in df.columns:
-                            try:
-                                s = df[c].astype(str).str.strip().fillna("")
-                            except Exception:
-                                continue
-                            if s.str.startswith("www.").any():
-                                return c
-                        domain_re = re.compile(r"\w+\.\w+")
-                        for c in df.columns:
-                            try:
-                                s = df[c].astype(str).str.strip().fillna("")
-                            except Exception:
-                                continue
-                            if s.apply(lambda x: bool(domain_re.search(x))).any():
-                                return c
-                        return None
-
-                    url_col = find_website_column(df)
-                    if not url_col:
-                        st.error("No website column found. Please include a column with company website URLs.")
-                        st.stop()
-
-                    progress = st.progress(0)
-                    records = []
-                    seen = {}
-
-                    for i, site in enumerate(df[url_col].astype(str)):
-                        raw, page = extract_address(site)
-                        parsed = standardize_address(raw)
-                        parsed["DATA SOURCE LINK"] = site
-                        parsed["FOUND PAGE"] = page
-                        parsed = enrich_with_nominatim(parsed)
-                        parsed["CONFIDENCE SCORE"] = calculate_confidence(parsed)
-
-                        h = hash_address(parsed)
-                        if h in seen:
-                            parsed["DUPLICATE FLAG"] = "YES"
-                            parsed["MASTER RECORD ID"] = seen[h]
-                        else:
-                            parsed["DUPLICATE FLAG"] = "NO"
-                            parsed["MASTER RECORD ID"] = h[:8]
-                            seen[h] = h[:8]
-
-                        records.append(parsed)
-                        progress.progress((i + 1) / max(1, len(df)))
-
-                    st.success(f"Processed {len(records)} records")
-                    st.dataframe(pd.DataFrame(records), use_container_width=True)
-                    st.download_button("📥 Download Excel", generate_excel(records), "siteintel_output.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-
-            else:
-                st.subheader("Single company check")
-                name = st.text_input("Company name (optional)")
-                website = st.text_input("Official website (e.g. example.com or https://example.com)")
-                if st.button("🔎 Check Single Company"):
-                    if not website:
-                        st.warning("Enter a website URL first.")
-                        st.stop()
-                    raw, page = extract_address(website)
-                    parsed = standardize_address(raw)
-                    parsed["DATA SOURCE LINK"] = website
-                    parsed["FOUND PAGE"] = page
-                    parsed = enrich_with_nominatim(parsed)
-                    parsed["CONFIDENCE SCORE"] = calculate_confidence(parsed)
-                    st.write("**Found page:**", page or "(not found)")
-                    st.write("**Raw extract:**", raw or "(no extract)")
-                    st.table(pd.DataFrame([parsed]))
-                    st.download_button("📥 Download Excel", generate_excel([parsed]), "siteintel_single.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-    # close the outer try in the top-level extract_address
-    except Exception:
-        pass
-
-    return ""
-
-        # -------------------------------------------------
-# -------------------------------------------------
-# CONFIDENCE SCORE
-# -------------------------------------------------
-def calculate_confidence(addr: dict) -> int:
-    score = 0
-
-    if addr["STREET ADDRESS 1"]:
-        score += 40
-    if addr["CITY"]:
-        score += 15
-    if addr["STATE"]:
-        score += 15
-    if addr["PIN CODE"]:
-        score += 15
-    if addr["COUNTRY"]:
-        score += 15
-
-    return min(score, 100)
-
-# -------------------------------------------------
-# EXCEL EXPORT
-# -------------------------------------------------
-def generate_excel(data: list) -> bytes:
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "SiteIntel Output"
-
-    ws.merge_cells("A1:J1")
-    ws["A1"] = "SiteIntel – By Kishor"
-    ws["A1"].font = Font(size=16, bold=True)
-    ws["A1"].alignment = Alignment(horizontal="center")
-
-    headers = [
-        "STREET ADDRESS 1", "STREET ADDRESS 2",
-        "CITY", "STATE", "PIN CODE", "COUNTRY",
-        "CONFIDENCE SCORE", "DUPLICATE FLAG",
-        "MASTER RECORD ID", "DATA SOURCE LINK"
-    ]
-
-    ws.append(headers)
-
-    for c in ws[2]:
-        c.font = Font(bold=True)
-
-    for r in data:
-        ws.append([r.get(h, "") for h in headers])
-
-    table = Table(
-        displayName="AddressTable",
-        ref=f"A2:J{len(data)+2}"
-    )
-    table.tableStyleInfo = TableStyleInfo(
-        name="TableStyleMedium9",
-        showRowStripes=True
-    )
-    ws.add_table(table)
-
-    for col in range(1, 11):
-        ws.column_dimensions[get_column_letter(col)].width = 25
-
-    ws.freeze_panes = "A3"
-
-    out = BytesIO()
-    wb.save(out)
-    return out.getvalue()
-
-# -------------------------------------------------
-# STREAMLIT UI
-# -------------------------------------------------
-st.set_page_config(page_title="SiteIntel – By Kishor", layout="wide", page_icon="📍")
-st.title("📍 SiteIntel")
-st.caption("Enterprise Address Intelligence")
-
-uploaded = st.file_uploader("Upload Excel with company websites", type=["xlsx", "xls"])
-
-prefer_hq = st.checkbox("Prefer HQ/Corporate addresses only (skip store/location pages)", value=True)
-extract_multiple = st.checkbox("Extract multiple locations per company (include store/outlet pages)", value=False)
-
-if st.button("🚀 Process"):
-
-    if not uploaded:
-        st.warning("Upload a file first.")
-        st.stop()
-
-    df = pd.read_excel(uploaded)
-
-    def find_website_column(df: pd.DataFrame):
-        # 1) Column name heuristics
-        for c in df.columns:
-            if re.search(r"web|site|url", str(c), re.I):
-                return c
-
-        # 2) Values starting with http
-        for c in df.columns:
-            try:
-                s = df[c].astype(str).str.strip().fillna("")
-            except Exception:
-                continue
-            if s.str.startswith("http").any():
-                return c
-
-        # 3) Values starting with www.
-        for c in df.columns:
-            try:
-                s = df[c].astype(str).str.strip().fillna("")
-            except Exception:
-                continue
-            if s.str.startswith("www.").any():
-                return c
-
-        # 4) Values that look like domains (e.g. example.com)
-        domain_re = re.compile(r"\w+\.\w+")
-        for c in df.columns:
-            try:
-                s = df[c].astype(str).str.strip().fillna("")
-            except Exception:
-                continue
-            if s.apply(lambda x: bool(domain_re.search(x))).any():
-                return c
-
-        return None
-
-    url_col = find_website_column(df)
-
-    if not url_col:
-        st.error("No website column found.")
-        st.stop()
-
-    progress = st.progress(0)
-    records = []
-    seen = {}
-
-    for i, site in enumerate(df[url_col].astype(str)):
-        if extract_multiple:
-            candidates = extract_all_addresses_site(site, limit=12)
-            if not candidates:
-                # fallback to single
-                candidates = [extract_address_site(site, prefer_hq=bool(prefer_hq))]
-        else:
-            candidates = [extract_address_site(site, prefer_hq=bool(prefer_hq))]
-
-        for raw, page in candidates:
-            parsed = standardize_address_dict(raw)
-            parsed["DATA SOURCE LINK"] = site
-            parsed["FOUND PAGE"] = page
-            parsed = enrich_with_nominatim(parsed)
-            parsed["CONFIDENCE SCORE"] = calculate_confidence(parsed)
-
-            h = hash_address(parsed)
-            if h in seen:
-                parsed["DUPLICATE FLAG"] = "YES"
-                parsed["MASTER RECORD ID"] = seen[h]
-            else:
-                parsed["DUPLICATE FLAG"] = "NO"
-                parsed["MASTER RECORD ID"] = h[:8]
-                seen[h] = h[:8]
-
-            records.append(parsed)
-
-        progress.progress((i + 1) / max(1, len(df)))
-
-    st.success(f"Processed {len(records)} records")
-
-    st.dataframe(pd.DataFrame(records), use_container_width=True)
-
-    st.download_button(
-        "📥 Download Excel",
-        generate_excel(records),
-        "siteintel_output.xlsx",
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+import streamlit as st
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import functools
+import operator
+import orjson
+import re
+import threading
+import time
+import xxhash
+from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+from io import BytesIO
+from unidecode import unidecode
+import xlsxwriter
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+REQUEST_DELAY = 0.15  # Google Maps throttle
+CRAWL_WORKERS = 16  # thread-pool width for the per-site crawl
+
+# One pooled session shared by every fetch: keep-alive skips the TCP/TLS
+# handshake on repeat requests to the same host, which the candidate-page
+# crawl does constantly. Thread-safe, so the worker pool shares it too.
+# cache_resource keeps the same session (and its warm connections) alive
+# across Streamlit reruns, which re-execute this module top to bottom.
+@st.cache_resource(show_spinner=False)
+def _build_session() -> requests.Session:
+    s = requests.Session()
+    s.headers.update(HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=64, pool_maxsize=64,
+        max_retries=Retry(total=2, backoff_factor=0.3,
+                          status_forcelist=(429, 500, 502, 503, 504)),
+    )
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+SESSION = _build_session()
+
+try:
+    GOOGLE_MAPS_API_KEY = st.secrets.get("GOOGLE_MAPS_API_KEY", "")
+except:
+    GOOGLE_MAPS_API_KEY = ""
+
+SHORT_FORMS = {
+    "RD": "ROAD", "ST": "STREET", "AVE": "AVENUE",
+    "BLVD": "BOULEVARD", "DR": "DRIVE",
+    "LN": "LANE", "PL": "PLACE"
+}
+
+STANDARD_COUNTRIES = {
+    "USA": "UNITED STATES OF AMERICA",
+    "US": "UNITED STATES OF AMERICA",
+    "UNITED STATES": "UNITED STATES OF AMERICA",
+    "UK": "UNITED KINGDOM OF GREAT BRITAIN AND NORTHERN IRELAND",
+    "UNITED KINGDOM": "UNITED KINGDOM OF GREAT BRITAIN AND NORTHERN IRELAND"
+}
+
+# -------------------------------------------------
+# HELPERS
+# -------------------------------------------------
+# Compiled once at import: per-call re.sub pays a pattern-cache probe per
+# invocation, and the abbreviation loop was recompiling its cache key for
+# every address in the batch.
+_CLEAN_WS = re.compile(r"\s+")
+# One alternation pass replaces a scan per abbreviation (longest keys
+# first for longest-match semantics); input is already uppercased by
+# normalize_text so no IGNORECASE needed.
+_ABBR_RE = re.compile(
+    r"\b(" + "|".join(sorted(map(re.escape, SHORT_FORMS), key=len, reverse=True)) + r")\b"
+)
+_RE_SPLIT_PARTS = re.compile(r",|;|\n")
+_RE_TRAIL_SLASH = re.compile(r"/+$")
+_RE_SCHEME = re.compile(r"https?://")
+# Anything that is not a URL, www. host or bare domain is not worth a
+# crawl attempt (each one would eat a DNS timeout plus retries).
+_RE_VALID_SITE = re.compile(r"^(https?://|www\.|\w[\w-]*\.\w+)", re.I)
+_RE_NUM = re.compile(r"\d{1,5}")
+# US zip and UK postcode fused into one alternation so the candidate
+# screen pays a single scan for the postal check
+_RE_POSTAL = re.compile(r"\b\d{5}(?:-\d{4})?\b|\b[A-Z]{1,2}\d[A-Z\d]?\s*\d[A-Z]{2}\b", re.I)
+_RE_PIN = re.compile(r"(\d{5}(?:-\d{4})?)")
+
+# Deletion table for everything [^\w\s] would strip: after the ASCII
+# check / transliteration below the text is pure ASCII, so str.translate
+# removes punctuation in one C scan instead of a regex walk.
+_PUNCT_DEL = {
+    i: None for i in range(128)
+    if not (chr(i).isalnum() or chr(i).isspace() or chr(i) == "_")
+}
+
+def normalize_text(text: str) -> str:
+    # unidecode is a no-op on pure-ASCII input but still pays a Python
+    # table lookup per character; isascii() is a cheap C scan, and most
+    # scraped addresses pass it.
+    text = text.upper() if text.isascii() else unidecode(text).upper()
+    text = text.translate(_PUNCT_DEL)
+    text = _CLEAN_WS.sub(" ", text)
+    return text.strip()
+
+_HASH_KEYS = ("STREET ADDRESS 1", "CITY", "STATE", "PIN CODE", "COUNTRY")
+
+
+def hash_address(addr: dict) -> str:
+    key = "|".join(addr.get(k, "") for k in _HASH_KEYS)
+    # Dedup key only, nothing cryptographic — xxh3 is an order of
+    # magnitude cheaper than md5 on short strings.
+    return xxhash.xxh3_64(key.encode()).hexdigest()
+
+# Pace Maps calls before the request goes out instead of sleeping the
+# full delay after every response; concurrent callers serialize on the
+# lock and only wait out what is left of the current window.
+_MAPS_LOCK = threading.Lock()
+_maps_last_call = 0.0
+
+
+def _maps_throttle():
+    global _maps_last_call
+    with _MAPS_LOCK:
+        wait = _maps_last_call + REQUEST_DELAY - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _maps_last_call = time.monotonic()
+
+
+def enrich_google_maps(rec: dict) -> dict:
+    """Fill city/state/pin/country from the Google Geocoding API.
+
+    Goes through the pooled SESSION so every call reuses a warm
+    connection to the Maps host, and passes params= so requests does the
+    URL encoding instead of a hand-built query string.
+    """
+    if not GOOGLE_MAPS_API_KEY or not rec.get("STREET ADDRESS 1"):
+        return rec
+
+    try:
+        _maps_throttle()
+        res = SESSION.get(
+            "https://maps.googleapis.com/maps/api/geocode/json",
+            params={"address": rec["STREET ADDRESS 1"], "key": GOOGLE_MAPS_API_KEY},
+            timeout=5,
+        )
+        # orjson decodes straight from the response bytes, skipping the
+        # intermediate text decode stdlib json would do.
+        data = orjson.loads(res.content)
+        if data.get("status") != "OK":
+            return rec
+
+        for comp in data["results"][0]["address_components"]:
+            if "locality" in comp["types"]:
+                rec["CITY"] = comp["long_name"].upper()
+            if "administrative_area_level_1" in comp["types"]:
+                rec["STATE"] = comp["short_name"].upper()
+            if "postal_code" in comp["types"]:
+                rec["PIN CODE"] = comp["long_name"]
+            if "country" in comp["types"]:
+                c = comp["long_name"].upper()
+                rec["COUNTRY"] = STANDARD_COUNTRIES.get(c, c)
+    except Exception:
+        pass
+
+    return rec
+
+
+# -------------------------------
+# Dict-style extraction + standardization (top-level)
+# -------------------------------
+def ensure_scheme(url: str) -> str:
+    if not url:
+        return ""
+    url = url.strip()
+    if not url.startswith("http"):
+        return "https://" + url.lstrip("/")
+    return url
+
+
+STREET_KEYWORDS = r"\b(STREET|ST\.|ROAD|RD\.|AVE|AVENUE|BOULEVARD|BLVD|DR|DRIVE|LANE|LN|WAY|TERRACE|PLAZA|PL|COURT|CT)\b"
+_RE_STREET = re.compile(STREET_KEYWORDS, re.I)
+EXCLUDE_SALES_KEYWORDS = [
+    "store", "stores", "location", "locations", "dealer", "retail",
+    "shop", "franchise", "outlet", "distributor", "sales"
+]
+
+# Pages and keywords we should prioritize when hunting for corporate addresses
+PREFERRED_PAGE_KEYWORDS = [
+    "contact", "contact-us", "contactus", "about", "about-us", "aboutus",
+    "head", "head-office", "headquarters", "hq", "office", "offices",
+    "locations", "location", "plant", "plants", "manufacturing", "factory", "site", "facility"
+]
+
+# Both keyword screens run per candidate line / per page URL; an
+# Aho-Corasick automaton finds any keyword in one pass over the text
+# instead of one substring scan per keyword (same trick as the street
+# scan below, and like it, the plain any() loop stays as the fallback).
+try:
+    import ahocorasick as _ahocorasick
+
+    def _build_automaton(words):
+        a = _ahocorasick.Automaton()
+        for w in words:
+            a.add_word(w, w)
+        a.make_automaton()
+        return a
+
+    _EXCLUDE_AC = _build_automaton(EXCLUDE_SALES_KEYWORDS)
+    _PREFERRED_AC = _build_automaton(PREFERRED_PAGE_KEYWORDS)
+except ImportError:
+    _EXCLUDE_AC = _PREFERRED_AC = None
+
+
+def _contains_any(text: str, automaton, keywords) -> bool:
+    if automaton is not None:
+        return next(automaton.iter(text), None) is not None
+    return any(k in text for k in keywords)
+
+
+def _is_sales_text(lowered: str) -> bool:
+    return _contains_any(lowered, _EXCLUDE_AC, EXCLUDE_SALES_KEYWORDS)
+
+
+# Any line the strict screen can accept contains a postal code or a
+# street keyword, so one finditer over the whole text locates the few
+# interesting lines in C and the Python loop only ever sees those.
+_RE_LINE_HINT = re.compile(_RE_POSTAL.pattern + "|" + STREET_KEYWORDS, re.I)
+
+
+def _iter_candidate_lines(text: str):
+    last_end = 0
+    for m in _RE_LINE_HINT.finditer(text):
+        if m.start() < last_end:
+            continue
+        start = text.rfind("\n", 0, m.start()) + 1
+        end = text.find("\n", m.end())
+        if end == -1:
+            end = len(text)
+        last_end = end
+        yield text[start:end].strip()
+
+CANDIDATE_PATHS = [
+    "/contact", "/contact-us", "/about", "/about-us", "/locations",
+    "/location", "/offices", "/head-office", "/headquarters", "/hq",
+    "/plants", "/manufacturing", "/factory", "/site", "/facility"
+]
+
+
+# When multi-location extraction falls back to the single-address path
+# the same homepage would be mined twice; memoizing on (url, max_pages)
+# makes the repeat free. Tuple return keeps cached values immutable.
+@functools.lru_cache(maxsize=2048)
+def _pages_for(home_url: str, max_pages: int) -> tuple:
+    home = ensure_scheme(home_url)
+    pages = [home]
+    # Track membership in a set alongside the ordered list: the loop used
+    # to rebuild set(pages) per anchor, which goes quadratic on pages
+    # with thousands of links.
+    known = {home}
+    try:
+        r = SESSION.get(home, headers=HEADERS, timeout=(3, 6))
+        # The homepage is only mined for hrefs, so skip soup entirely:
+        # one C-level parse plus an XPath pulls every anchor target.
+        for href in lxml_html.fromstring(r.content).xpath("//a/@href"):
+            href = href.strip()
+            if href.startswith("/"):
+                href = home.rstrip("/") + href
+            elif not href.startswith("http"):
+                continue
+            if href not in known:
+                known.add(href)
+                pages.append(href)
+            if len(pages) >= max_pages:
+                break
+    except Exception:
+        pass
+
+    base = _RE_TRAIL_SLASH.sub("", home)
+    # add preferred candidate paths first
+    for p in CANDIDATE_PATHS:
+        pages.append(base + p)
+
+    # dedupe and prioritize pages whose path contains preferred keywords
+    ordered = []
+    seen = set()
+    # First, add pages that match preferred keywords
+    for p in pages:
+        lp = p.lower()
+        if _contains_any(lp, _PREFERRED_AC, PREFERRED_PAGE_KEYWORDS):
+            if p not in seen:
+                ordered.append(p)
+                seen.add(p)
+    # Then add the rest preserving order
+    for p in pages:
+        if p not in seen:
+            ordered.append(p)
+            seen.add(p)
+
+    return tuple(ordered[:max_pages])
+
+
+def find_pages_from_home(home_url: str, max_pages=10):
+    return list(_pages_for(home_url, max_pages))
+
+
+# Addresses live in headers/footers/contact blocks; reading past this
+# much of a crawled page buys parse time, not recall.
+MAX_CRAWL_BYTES = 512 * 1024
+
+
+def _prefetch_pages(pages, timeout=(3, 6)):
+    """Fetch candidate pages concurrently, returning {page: body bytes}.
+
+    The pages are independent, so their round trips overlap in a small
+    pool; callers still evaluate them in priority order, they just never
+    wait on the network between pages. Failures map to None. Bodies are
+    streamed and capped so a multi-MB page costs at most MAX_CRAWL_BYTES
+    of bandwidth and parsing.
+    """
+    def _get(p):
+        try:
+            with SESSION.get(ensure_scheme(p), headers=HEADERS,
+                             timeout=timeout, stream=True) as r:
+                return r.raw.read(MAX_CRAWL_BYTES, decode_content=True)
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        return dict(zip(pages, ex.map(_get, pages)))
+
+
+# Both extractors fall back to the same DuckDuckGo search; memoizing on
+# (domain, terms) means the multi-location pass reuses the single-pass
+# search instead of re-posting it, and one lxml parse plus an XPath
+# replaces the full anchor traversal.
+@functools.lru_cache(maxsize=1024)
+def _ddg_search(domain: str, terms: str, max_links: int) -> tuple:
+    res = SESSION.post("https://html.duckduckgo.com/html/",
+                       data={"q": f"site:{domain} {terms}"},
+                       headers=HEADERS, timeout=(3, 6))
+    links = []
+    for href in lxml_html.fromstring(res.content).xpath("//a/@href"):
+        if href.startswith("http") and domain in href:
+            links.append(href)
+            if len(links) >= max_links:
+                break
+    return tuple(links)
+
+
+def extract_address_site(website: str, prefer_hq: bool = True):
+    """Return (raw_address, found_page) or ("", "").
+
+    If `prefer_hq` is True, pages or sections that look like retail/store locations
+    will be deprioritized or skipped.
+    """
+    if not website:
+        return "", ""
+    domain = _RE_SCHEME.sub("", website).split("/", 1)[0]
+    pages = find_pages_from_home(website, max_pages=12)
+    bodies = _prefetch_pages(pages)
+
+    visited = set()
+    # Depth-first crawl (pages + one-level internal links)
+    for p in pages:
+        try:
+            if p in visited:
+                continue
+            visited.add(p)
+            body = bodies.get(p)
+            if body is None:
+                continue
+            soup = BeautifulSoup(body, "lxml")
+            addr_tag = soup.find("address")
+            if addr_tag:
+                txt = addr_tag.get_text(" ", strip=True)
+                if txt:
+                    # prefer corporate pages: boost pages with 'contact'/'about' or 'head office'
+                    txt_low = txt.lower()
+                    if prefer_hq and _is_sales_text(txt_low):
+                        # skip sales pages if preferring HQ
+                        pass
+                    else:
+                        return normalize_text(txt), ensure_scheme(p)
+
+            text = soup.get_text(" ", strip=True)
+            # search for strict address candidates
+            for cand in _iter_candidate_lines(text):
+                if is_strict_address_candidate(cand):
+                    cand_low = cand.lower()
+                    if prefer_hq and _is_sales_text(cand_low):
+                        # deprioritize store/location blocks
+                        continue
+                    return normalize_text(cand), ensure_scheme(p)
+            # if not found on this page, collect internal links for one more depth
+            internal_links = []
+            for a in soup.find_all("a", href=True):
+                href = a["href"].strip()
+                if href.startswith("/"):
+                    internal_links.append(ensure_scheme(domain + href))
+                elif href.startswith("http") and domain in href:
+                    internal_links.append(href)
+            # crawl one level of internal links; prefetch the batch so the
+            # round trips overlap like the candidate pages above
+            deeper = [l for l in internal_links[:6] if l not in visited]
+            visited.update(deeper)
+            deep_bodies = _prefetch_pages(deeper)
+            for link in deeper:
+                body2 = deep_bodies.get(link)
+                if body2 is None:
+                    continue
+                try:
+                    txt2 = BeautifulSoup(body2, "lxml").get_text(" ", strip=True)
+                    for line in _iter_candidate_lines(txt2):
+                        if is_strict_address_candidate(line):
+                            cand_low = line.lower()
+                            if prefer_hq and _is_sales_text(cand_low):
+                                continue
+                            return normalize_text(line), link
+                except Exception:
+                    continue
+        except Exception:
+            continue
+
+    # fallback: try duckduckgo-lite search
+    try:
+        # broaden search terms to prefer contact/location/headquarter/manufacturing pages
+        query_terms = "contact OR contact us OR locations OR headquarters OR head office OR plant OR manufacturing OR office"
+        links = list(_ddg_search(domain, query_terms, 6))
+        link_bodies = _prefetch_pages(links)
+        for link in links:
+            body = link_bodies.get(link)
+            if body is None:
+                continue
+            try:
+                txt = BeautifulSoup(body, "lxml").get_text(" ", strip=True)
+                for line in _iter_candidate_lines(txt):
+                    if is_strict_address_candidate(line):
+                        cand_low = line.lower()
+                        if prefer_hq and _is_sales_text(cand_low):
+                            continue
+                        return normalize_text(line), link
+            except Exception:
+                continue
+    except Exception:
+        pass
+
+    return "", ""
+
+
+def extract_all_addresses_site(website: str, limit: int = 20):
+    """Return list of (raw_address, found_page) found across the site (breadth-first).
+
+    This is used when the user wants multiple facility/store locations for a company.
+    """
+    out = []
+    if not website:
+        return out
+    domain = _RE_SCHEME.sub("", website).split("/", 1)[0]
+    pages = find_pages_from_home(website, max_pages=30)
+    bodies = _prefetch_pages(pages)
+    visited = set()
+    # membership set alongside the ordered list: the linear rescan of
+    # out per candidate goes quadratic as limit grows
+    seen_norms = set()
+
+    def collect_from_text(text, page):
+        for cand in _iter_candidate_lines(text):
+            if is_strict_address_candidate(cand):
+                norm = normalize_text(cand)
+                if norm and norm not in seen_norms:
+                    seen_norms.add(norm)
+                    out.append((norm, page))
+                    if len(out) >= limit:
+                        return True
+        return False
+
+    # scan listed pages and one-level internal links
+    for p in pages:
+        if p in visited:
+            continue
+        visited.add(p)
+        try:
+            body = bodies.get(p)
+            if body is None:
+                continue
+            soup = BeautifulSoup(body, "lxml")
+            # address tags
+            for tag in soup.find_all("address"):
+                txt = tag.get_text(" ", strip=True)
+                if txt and collect_from_text(txt, ensure_scheme(p)):
+                    return out
+
+            text = soup.get_text(" ", strip=True)
+            if collect_from_text(text, ensure_scheme(p)):
+                return out
+
+            # gather internal links to scan shallowly
+            links = []
+            for a in soup.find_all("a", href=True):
+                href = a["href"].strip()
+                if href.startswith("/"):
+                    links.append(ensure_scheme(domain + href))
+                elif href.startswith("http") and domain in href:
+                    links.append(href)
+            for link in links[:10]:
+                if link in visited:
+                    continue
+                visited.add(link)
+                try:
+                    r2 = SESSION.get(link, headers=HEADERS, timeout=(3, 6))
+                    txt2 = BeautifulSoup(r2.content, "lxml").get_text(" ", strip=True)
+                    if collect_from_text(txt2, link):
+                        return out
+                except Exception:
+                    continue
+        except Exception:
+            continue
+
+    # fallback DDG
+    try:
+        links = list(_ddg_search(domain, "contact address", 20))
+        link_bodies = _prefetch_pages(links)
+        for link in links:
+            body = link_bodies.get(link)
+            if body is None:
+                continue
+            try:
+                txt = BeautifulSoup(body, "lxml").get_text(" ", strip=True)
+                if collect_from_text(txt, link):
+                    return out
+            except Exception:
+                continue
+    except Exception:
+        pass
+
+    return out
+
+
+def is_strict_address_candidate(text: str) -> bool:
+    """Return True if text looks like a physical postal address.
+
+    Heuristics: must contain a street number OR a postal code, and a street keyword
+    (street type) OR common postal code pattern. This avoids grabbing hero text.
+    """
+    if not text or len(text.strip()) < 10:
+        return False
+    t = text.strip()
+    # cheap rejects before any regex runs: paragraph-length lines,
+    # contact emails and marketing boilerplate
+    if len(t) > 300:
+        return False
+    if "@" in t or t[:4].lower() in ("news", "data"):
+        return False
+    # require (number and street) OR postal; the postal alternatives are
+    # fused into one pattern and the whole check short-circuits, so most
+    # non-address lines cost a single scan instead of three
+    return bool(
+        _RE_POSTAL.search(t)
+        or (_RE_NUM.search(t) and _RE_STREET.search(t))
+    )
+
+
+def standardize_address_dict(raw: str) -> dict:
+    out = {
+        "STREET ADDRESS 1": "",
+        "STREET ADDRESS 2": "",
+        "CITY": "",
+        "STATE": "",
+        "PIN CODE": "",
+        "COUNTRY": "",
+    }
+    if not raw:
+        return out
+    r = normalize_text(raw)
+    r = _ABBR_RE.sub(lambda m: SHORT_FORMS[m.group(1)], r)
+
+    parts = [p.strip() for p in _RE_SPLIT_PARTS.split(r) if p.strip()]
+    if parts:
+        out["STREET ADDRESS 1"] = parts[0]
+    if len(parts) >= 2:
+        last = parts[-1]
+        m = _RE_PIN.search(last)
+        if m:
+            out["PIN CODE"] = m.group(1)
+            last = last.replace(m.group(1), "").strip()
+        tokens = [t.strip() for t in last.split() if t.strip()]
+        if tokens:
+            if len(tokens) == 1 and len(tokens[0]) <= 3:
+                out["STATE"] = tokens[0]
+            else:
+                out["COUNTRY"] = tokens[-1]
+    if len(parts) >= 3:
+        out["CITY"] = parts[-2]
+
+    return out
+
+
+# Nominatim's usage policy allows 1 request/second.  Instead of sleeping a
+# full second after every successful call, a lock plus a last-call
+# timestamp makes each caller wait only for the remainder of the current
+# one-second window (often nothing when parsing time exceeds it).
+_NOMINATIM_LOCK = threading.Lock()
+_nominatim_last_call = 0.0
+
+
+def _nominatim_throttle():
+    global _nominatim_last_call
+    with _NOMINATIM_LOCK:
+        wait = _nominatim_last_call + 1.0 - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _nominatim_last_call = time.monotonic()
+
+
+# st.cache_data instead of lru_cache so hits survive app restarts
+# (persist="disk"), matching the Maps payload cache in app_full; the
+# key is the normalized field tuple, so duplicate rows and re-uploads
+# of the same list never re-hit the endpoint.
+@st.cache_data(ttl=30 * 86400, show_spinner=False, persist="disk")
+def _nominatim_lookup(street: str, city: str, state: str, country: str) -> tuple:
+    q = ", ".join([street, city, state, country]).strip().strip(',')
+    if not q:
+        return ()
+    # Network errors propagate: st.cache_data does not store raised
+    # exceptions, so a transient failure never pins an empty result for
+    # the 30-day TTL. Only a genuine empty answer caches as ().
+    _nominatim_throttle()
+    url = "https://nominatim.openstreetmap.org/search"
+    res = SESSION.get(url, params={"q": q, "format": "json", "addressdetails": 1, "limit": 1}, headers={**HEADERS, "User-Agent": "SiteIntel/1.0 (mailto:you@example.com)"}, timeout=(3, 7))
+    data = res.json()
+    if data:
+        addr = data[0].get("address", {})
+        return tuple(sorted(addr.items()))
+    return ()
+
+
+def enrich_with_nominatim(record: dict) -> dict:
+    # Enrichment can only fill blanks; when the parser already produced
+    # every field the round-trip (and its 1 req/s budget) buys nothing.
+    if all(record.get(k) for k in ("CITY", "STATE", "PIN CODE", "COUNTRY")):
+        return record
+    try:
+        addr = dict(_nominatim_lookup(
+            record.get("STREET ADDRESS 1", ""),
+            record.get("CITY", ""),
+            record.get("STATE", ""),
+            record.get("COUNTRY", ""),
+        ))
+    except Exception:
+        return record
+    if addr:
+        if not record.get("CITY") and addr.get("city"):
+            record["CITY"] = addr.get("city").upper()
+        if not record.get("STATE") and addr.get("state"):
+            record["STATE"] = addr.get("state").upper()
+        if not record.get("PIN CODE") and addr.get("postcode"):
+            record["PIN CODE"] = addr.get("postcode")
+        if not record.get("COUNTRY") and addr.get("country"):
+            record["COUNTRY"] = addr.get("country").upper()
+    return record
+
+# -------------------------------------------------
+# CONFIDENCE SCORE
+# -------------------------------------------------
+def calculate_confidence(addr: dict) -> int:
+    score = 0
+
+    if addr["STREET ADDRESS 1"]:
+        score += 40
+    if addr["CITY"]:
+        score += 15
+    if addr["STATE"]:
+        score += 15
+    if addr["PIN CODE"]:
+        score += 15
+    if addr["COUNTRY"]:
+        score += 15
+
+    return min(score, 100)
+
+# -------------------------------------------------
+# EXCEL EXPORT
+# -------------------------------------------------
+def generate_excel(data: list) -> BytesIO:
+    headers = [
+        "STREET ADDRESS 1", "STREET ADDRESS 2",
+        "CITY", "STATE", "PIN CODE", "COUNTRY",
+        "CONFIDENCE SCORE", "DUPLICATE FLAG",
+        "MASTER RECORD ID", "DATA SOURCE LINK"
+    ]
+
+    # itemgetter pulls all ten fields in one C call; the per-header
+    # .get comprehension only runs for the odd record missing a key.
+    getter = operator.itemgetter(*headers)
+
+    # Track column widths while building rows — one pass over the data,
+    # O(1) state per column — instead of re-reading every cell afterwards.
+    rows = []
+    col_widths = [len(h) for h in headers]
+    for r in data:
+        try:
+            row = list(getter(r))
+        except KeyError:
+            row = [r.get(h, "") for h in headers]
+        for i, v in enumerate(row):
+            w = len(str(v))
+            if w > col_widths[i]:
+                col_widths[i] = w
+        rows.append(row)
+
+    # constant_memory streams each finished row out immediately, so peak
+    # RAM is a single row however large the batch gets. Rows must be
+    # written strictly top-to-bottom (already true here); tables are not
+    # supported in this mode, so the header gets an autofilter instead.
+    out = BytesIO()
+    wb = xlsxwriter.Workbook(out, {"constant_memory": True, "in_memory": True})
+    ws = wb.add_worksheet("SiteIntel Output")
+
+    title_fmt = wb.add_format({"bold": True, "font_size": 16, "align": "center"})
+    bold_fmt = wb.add_format({"bold": True})
+
+    for i, w in enumerate(col_widths):
+        ws.set_column(i, i, min(max(w + 2, 10), 50))
+
+    ws.freeze_panes(2, 0)
+
+    ws.merge_range("A1:J1", "SiteIntel – By Kishor", title_fmt)
+    ws.write_row(1, 0, headers, bold_fmt)
+
+    for idx, row in enumerate(rows, start=2):
+        ws.write_row(idx, 0, row)
+
+    ws.autofilter(1, 0, len(rows) + 1, len(headers) - 1)
+
+    wb.close()
+    # Hand the buffer itself to st.download_button (it accepts file-likes)
+    # rather than getvalue(), which would duplicate the whole workbook in
+    # a second bytes object.
+    out.seek(0)
+    return out
+
+# -------------------------------------------------
+# PIPELINE
+# -------------------------------------------------
+def find_website_column(df: pd.DataFrame):
+    # 1) Column name heuristics: one vectorized scan over the header row
+    # instead of a Python regex search per column
+    cols = pd.Index(df.columns).astype(str).str.lower()
+    mask = cols.str.contains(r"web|site|url", regex=True, na=False)
+    if mask.any():
+        return df.columns[mask.argmax()]
+
+    # Convert every column to stripped strings once; the three value
+    # heuristics below reuse these instead of rebuilding the same Series
+    # per pass, which copied a wide frame up to three times.
+    strs = {}
+    for c in df.columns:
+        try:
+            strs[c] = df[c].astype(str).str.strip().fillna("")
+        except Exception:
+            pass
+
+    # 2) Values starting with http
+    for c, s in strs.items():
+        if s.str.startswith("http").any():
+            return c
+
+    # 3) Values starting with www.
+    for c, s in strs.items():
+        if s.str.startswith("www.").any():
+            return c
+
+    # 4) Values that look like domains (e.g. example.com)
+    for c, s in strs.items():
+        if s.str.contains(r"\w+\.\w+", regex=True, na=False).any():
+            return c
+
+    return None
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def process_workbook(file_bytes: bytes, prefer_hq: bool, extract_multiple: bool) -> list:
+    """Run the full scrape/standardize/enrich/dedup pipeline.
+
+    Cached on the upload bytes and the two toggles, so reruns triggered
+    by unrelated widget interaction return the finished records instead
+    of re-scraping every site.
+    """
+    # calamine parses xlsx several times faster than the DOM-building
+    # default engine; the whole pipeline is already cached on the upload
+    # bytes, so the parse happens once per file content.
+    try:
+        df = pd.read_excel(BytesIO(file_bytes), engine="calamine")
+    except ImportError:
+        df = pd.read_excel(BytesIO(file_bytes))
+
+    url_col = find_website_column(df)
+    if not url_col:
+        raise ValueError("No website column found.")
+
+    progress = st.progress(0)
+    records = []
+    seen = {}
+
+    def _extract_one(site):
+        if extract_multiple:
+            candidates = extract_all_addresses_site(site, limit=12)
+            if not candidates:
+                # fallback to single
+                candidates = [extract_address_site(site, prefer_hq=prefer_hq)]
+        else:
+            candidates = [extract_address_site(site, prefer_hq=prefer_hq)]
+        return candidates
+
+    # The crawl is pure network wait, so fan it out across a thread pool
+    # sharing the pooled SESSION; results are collected back into input
+    # order so downstream dedup stays deterministic. An aiohttp rewrite
+    # would buy the same overlap, but the crawl helpers below this layer
+    # (candidate paths, one-level links, DDG fallback) are synchronous
+    # through and through — threads give the concurrency without forking
+    # every helper into an async twin.
+    # One vectorized pass pulls the column out as plain strings; empty
+    # cells round-trip through astype(str) as the literal 'nan', so drop
+    # those before they waste a crawl slot.
+    sites = df[url_col].astype(str).str.strip().tolist()
+    sites = [s for s in sites if s and s.lower() != "nan"]
+
+    # Uploads repeat websites (franchises, parent companies); crawl each
+    # unique site once and join the results back per input row.
+    unique_sites = list(dict.fromkeys(sites))
+    results_by_site = {}
+    # Cells that cannot be a URL or bare domain would still cost a DNS
+    # timeout (plus retries) per crawl; give them an empty result up
+    # front and keep the pool for plausible sites.
+    crawlable = []
+    for s in unique_sites:
+        if _RE_VALID_SITE.match(s):
+            crawlable.append(s)
+        else:
+            results_by_site[s] = [("", "")]
+    unique_sites = crawlable
+    # Each progress call is a frontend message roundtrip; at thousands of
+    # sites that serializes the loop, so only update every ~1%.
+    step = max(1, len(unique_sites) // 100)
+    with ThreadPoolExecutor(max_workers=CRAWL_WORKERS) as ex:
+        futures = {ex.submit(_extract_one, s): s for s in unique_sites}
+        for done, fut in enumerate(as_completed(futures), 1):
+            results_by_site[futures[fut]] = fut.result()
+            if done % step == 0 or done == len(unique_sites):
+                progress.progress(done / max(1, len(unique_sites)))
+
+    for site in sites:
+        candidates = results_by_site[site]
+        for raw, page in candidates:
+            parsed = standardize_address_dict(raw)
+            parsed["DATA SOURCE LINK"] = site
+            parsed["FOUND PAGE"] = page
+            # Only pay a geocoder round-trip when the heuristic parse
+            # left gaps worth filling; Google Maps first when a key is
+            # configured, free Nominatim as the fallback.
+            if calculate_confidence(parsed) < 85:
+                if GOOGLE_MAPS_API_KEY:
+                    parsed = enrich_google_maps(parsed)
+                if calculate_confidence(parsed) < 85:
+                    parsed = enrich_with_nominatim(parsed)
+            parsed["CONFIDENCE SCORE"] = calculate_confidence(parsed)
+
+            h = hash_address(parsed)
+            if h in seen:
+                parsed["DUPLICATE FLAG"] = "YES"
+                parsed["MASTER RECORD ID"] = seen[h]
+            else:
+                parsed["DUPLICATE FLAG"] = "NO"
+                parsed["MASTER RECORD ID"] = h[:8]
+                seen[h] = h[:8]
+
+            records.append(parsed)
+
+    return records
+
+# -------------------------------------------------
+# STREAMLIT UI
+# -------------------------------------------------
+st.set_page_config(page_title="SiteIntel – By Kishor", layout="wide", page_icon="📍")
+st.title("📍 SiteIntel")
+st.caption("Enterprise Address Intelligence")
+
+uploaded = st.file_uploader("Upload Excel with company websites", type=["xlsx", "xls"])
+
+prefer_hq = st.checkbox("Prefer HQ/Corporate addresses only (skip store/location pages)", value=True)
+extract_multiple = st.checkbox("Extract multiple locations per company (include store/outlet pages)", value=False)
+
+if st.button("🚀 Process"):
+
+    if not uploaded:
+        st.warning("Upload a file first.")
+        st.stop()
+
+    try:
+        records = process_workbook(uploaded.getvalue(), bool(prefer_hq), bool(extract_multiple))
+    except ValueError as exc:
+        st.error(str(exc))
+        st.stop()
+
+    st.success(f"Processed {len(records)} records")
+
+    st.dataframe(pd.DataFrame(records), use_container_width=True)
+
+    st.download_button(
+        "📥 Download Excel",
+        generate_excel(records),
+        "siteintel_output.xlsx",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
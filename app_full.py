@@ -1,22 +1,42 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import aiohttp
+import asyncio
+import orjson
+import operator
 import re
 import time
-import hashlib
-from bs4 import BeautifulSoup
-from io import BytesIO
+import xxhash
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+from io import BytesIO, StringIO
+from tempfile import SpooledTemporaryFile
+from xml.sax.saxutils import escape
+import zipfile
 from unidecode import unidecode
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment
-from openpyxl.worksheet.table import Table, TableStyleInfo
-from openpyxl.utils import get_column_letter
+import xlsxwriter
 
 # -------------------------------------------------
 # CONFIG
 # -------------------------------------------------
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 REQUEST_DELAY = 0.15  # Google Maps throttle
+BATCH_CONCURRENCY = 10  # polite-crawling cap for the async fan-out
+FETCH_TIMEOUT = 10
+MAX_PAGE_BYTES = 2 * 1024 * 1024  # cap per-page download size
+
+# One pooled session for all sync fetches: keep-alive skips the TCP/TLS
+# handshake per call (the Maps endpoint is a single host and benefits most)
+# and transient failures retry with backoff.
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32,
+                       max_retries=Retry(total=3, backoff_factor=0.3))
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
 
 try:
     GOOGLE_MAPS_API_KEY = st.secrets.get("GOOGLE_MAPS_API_KEY", "")
@@ -37,133 +57,411 @@ STANDARD_COUNTRIES = {
     "UNITED KINGDOM": "UNITED KINGDOM OF GREAT BRITAIN AND NORTHERN IRELAND"
 }
 
+# Compiled once at import; one alternation pass replaces a re.sub per
+# abbreviation (longest keys first for longest-match semantics).
+_SHORT_RE = re.compile(
+    r"\b(" + "|".join(sorted(map(re.escape, SHORT_FORMS), key=len, reverse=True)) + r")\b"
+)
+
 # -------------------------------------------------
 # HELPERS
 # -------------------------------------------------
-def normalize_text(text: str) -> str:
-    text = unidecode(text).upper()
-    text = re.sub(r"[^\w\s]", "", text)
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+_HASH_KEYS = ("STREET ADDRESS 1", "CITY", "STATE", "PIN CODE", "COUNTRY")
+
 
 def hash_address(addr: dict) -> str:
-    key = "|".join([
-        addr.get("STREET ADDRESS 1", ""),
-        addr.get("CITY", ""),
-        addr.get("STATE", ""),
-        addr.get("PIN CODE", ""),
-        addr.get("COUNTRY", "")
-    ])
-    return hashlib.md5(key.encode()).hexdigest()
+    key = "|".join(addr.get(k, "") for k in _HASH_KEYS)
+    # Dedup key only, nothing cryptographic — xxh3 hashes these short
+    # strings several times faster than md5.
+    return xxhash.xxh3_64_hexdigest(key.encode())
 
 # -------------------------------------------------
 # ADDRESS EXTRACTION
 # -------------------------------------------------
-def extract_address(website: str) -> str:
+# Straining the first parse to <address> lets lxml throw away every other
+# subtree at tokenization time.
+_ADDRESS_STRAINER = SoupStrainer("address")
+_STREET_KEYWORDS = ("street", "road", "ave", "avenue", "boulevard", "drive", "lane")
+_STREET_RE = re.compile(r'\b(STREET|ROAD|AVE|AVENUE|BOULEVARD|DRIVE|LANE)\b')
+
+# A single Aho-Corasick automaton finds any street keyword in one O(n)
+# pass over the lowered text, replacing the per-candidate uppercase +
+# regex-alternation scan; the regex stays as a fallback when the C
+# extension is unavailable.
+try:
+    import ahocorasick
+
+    _STREET_AC = ahocorasick.Automaton()
+    for _i, _kw in enumerate(_STREET_KEYWORDS):
+        _STREET_AC.add_word(_kw, (_i, _kw))
+    _STREET_AC.make_automaton()
+except ImportError:
+    _STREET_AC = None
+
+def _has_street_keyword(text: str) -> bool:
+    if _STREET_AC is not None:
+        lower = text.casefold()
+        last = len(lower) - 1
+        for end, (_i, kw) in _STREET_AC.iter(lower):
+            # keep the regex's \b semantics: reject hits inside words
+            # ("ave" in "have", "lane" in "planet")
+            start = end - len(kw) + 1
+            if ((start == 0 or not lower[start - 1].isalnum())
+                    and (end == last or not lower[end + 1].isalnum())):
+                return True
+        return False
+    return _STREET_RE.search(text.upper()) is not None
+
+_JSONLD_ADDR_KEYS = ("streetAddress", "addressLocality", "addressRegion",
+                     "postalCode", "addressCountry")
+
+
+def _walk_jsonld(node):
+    """Yield every PostalAddress object nested anywhere in a JSON-LD blob."""
+    if isinstance(node, dict):
+        if node.get("@type") == "PostalAddress":
+            yield node
+        for v in node.values():
+            yield from _walk_jsonld(v)
+    elif isinstance(node, list):
+        for v in node:
+            yield from _walk_jsonld(v)
+
+
+def _structured_address(html: bytes) -> str:
+    """Pull an address from schema.org markup (JSON-LD or microdata).
+
+    Enterprise homepages usually declare a PostalAddress; reading it is
+    one targeted XPath instead of a walk over every candidate element,
+    and the result arrives already fielded. The byte-level marker check
+    keeps pages without structured data at zero parse cost.
+    """
+    if b"PostalAddress" not in html:
+        return ""
     try:
-        if not website.startswith("http"):
-            website = "https://" + website
+        tree = etree.fromstring(html, etree.HTMLParser())
+        if tree is None:
+            return ""
+        for blob in tree.xpath('//script[@type="application/ld+json"]/text()'):
+            try:
+                # orjson rejects lxml's str subclass, so downcast first
+                data = orjson.loads(str(blob))
+            except Exception:
+                continue
+            for addr in _walk_jsonld(data):
+                parts = [str(addr[k]).strip() for k in _JSONLD_ADDR_KEYS
+                         if isinstance(addr.get(k), (str, int))]
+                if parts:
+                    return ", ".join(p for p in parts if p)
+        for el in tree.xpath('//*[contains(@itemtype, "PostalAddress")]'):
+            txt = " ".join(t.strip() for t in el.itertext() if t.strip())
+            if txt:
+                return txt
+    except Exception:
+        pass
+    return ""
 
-        res = requests.get(website, headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(res.text, "html.parser")
 
-        tag = soup.find("address")
-        if tag:
-            return tag.get_text(" ", strip=True)
+def _address_from_html(html) -> str:
+    if isinstance(html, str):
+        html = html.encode("utf-8", "ignore")
 
-        for el in soup.find_all(["footer", "p", "div"]):
-            txt = el.get_text(" ", strip=True)
-            if re.search(r'\b(STREET|ROAD|AVE|AVENUE|BOULEVARD|DRIVE|LANE)\b', txt.upper()):
-                return txt
+    # lxml's C parser is several times faster than html.parser; passing
+    # bytes lets it do its own encoding detection without a decode pass.
+    soup = BeautifulSoup(html, "lxml", parse_only=_ADDRESS_STRAINER)
 
+    tag = soup.find("address")
+    if tag:
+        return tag.get_text(" ", strip=True)
+
+    # Structured data beats scanning: schema.org markup names the fields
+    # outright, so check it before falling back to the element walk.
+    structured = _structured_address(html)
+    if structured:
+        return structured
+
+    # Incremental fallback: walk candidate elements as they close and stop
+    # at the first street-keyword hit, clearing nodes so the tree never
+    # holds more than the current subtree.
+    try:
+        for _event, el in etree.iterparse(BytesIO(html), events=("end",),
+                                          tag=("footer", "p", "div"), html=True):
+            txt = " ".join(t.strip() for t in el.itertext() if t.strip())
+            if txt and _has_street_keyword(txt):
+                return txt
+            el.clear()
     except Exception:
         pass
 
     return ""
 
 # -------------------------------------------------
-# STANDARDIZATION
+# GOOGLE MAPS ENRICHMENT
 # -------------------------------------------------
-def standardize_address(raw: str) -> str:
-    if not raw:
-        return ""
+def _apply_maps_components(record: dict, components: list) -> dict:
+    for comp in components:
+        if "locality" in comp["types"]:
+            record["CITY"] = comp["long_name"].upper()
+        if "administrative_area_level_1" in comp["types"]:
+            record["STATE"] = comp["short_name"].upper()
+        if "postal_code" in comp["types"]:
+            record["PIN CODE"] = comp["long_name"]
+        if "country" in comp["types"]:
+            c = comp["long_name"].upper()
+            record["COUNTRY"] = STANDARD_COUNTRIES.get(c, c)
+    return record
 
-    addr = normalize_text(raw)
+def _maps_url(query: str) -> str:
+    return (
+        "https://maps.googleapis.com/maps/api/geocode/json"
+        f"?address={query}&key={GOOGLE_MAPS_API_KEY}"
+    )
 
-    for k, v in SHORT_FORMS.items():
-        addr = re.sub(rf"\b{k}\b", v, addr)
+@st.cache_data(ttl=30 * 86400, show_spinner=False, persist="disk")
+def _geocode_raw(query: str) -> dict:
+    """Fetch and cache the raw Maps payload for a query.
 
-    return addr
+    st.cache_data keys on the query string; persist="disk" carries the
+    entries across app restarts, so re-processing the same list never
+    re-pays API latency or billing even in a fresh process. The
+    throttle only applies to actual network calls. Failures propagate
+    so a transient error is never cached for the 30-day TTL.
+    """
+    res = orjson.loads(SESSION.get(_maps_url(query), timeout=(3, 7)).content)
+    time.sleep(REQUEST_DELAY)
+    return res
 
 # -------------------------------------------------
-# GOOGLE MAPS ENRICHMENT
+# ASYNC BATCH PIPELINE
 # -------------------------------------------------
-def enrich_google_maps(record: dict) -> dict:
+async def _fetch_html(session, url: str):
+    try:
+        if not url.startswith("http"):
+            url = "https://" + url
+        async with session.get(url, headers={**HEADERS, "Accept": "text/html"},
+                               timeout=aiohttp.ClientTimeout(total=FETCH_TIMEOUT)) as res:
+            # Refuse non-HTML bodies from the headers alone and cap how
+            # much of a page we ever hold — one link to a PDF or video
+            # should not pin memory and parse time for the whole batch.
+            ctype = res.headers.get("Content-Type", "").split(";")[0].strip()
+            if ctype not in ("text/html", "application/xhtml+xml", ""):
+                return None
+            return await res.content.read(MAX_PAGE_BYTES)
+    except Exception:
+        return None
+
+async def enrich_google_maps_async(record: dict) -> dict:
+    # st.cache_data is sync-only, so the lookup runs in a worker thread;
+    # that way the enricher shares _geocode_raw's disk-persisted cache
+    # instead of a per-run dict that every script rerun rebuilds.
     if not GOOGLE_MAPS_API_KEY or not record["STREET ADDRESS 1"]:
         return record
 
     try:
-        query = record["STREET ADDRESS 1"]
-        url = (
-            "https://maps.googleapis.com/maps/api/geocode/json"
-            f"?address={query}&key={GOOGLE_MAPS_API_KEY}"
-        )
-
-        res = requests.get(url, timeout=10).json()
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(None, _geocode_raw,
+                                          record["STREET ADDRESS 1"])
 
-        if res.get("status") != "OK":
+        if data.get("status") != "OK":
             return record
 
-        for comp in res["results"][0]["address_components"]:
-            if "locality" in comp["types"]:
-                record["CITY"] = comp["long_name"].upper()
-            if "administrative_area_level_1" in comp["types"]:
-                record["STATE"] = comp["short_name"].upper()
-            if "postal_code" in comp["types"]:
-                record["PIN CODE"] = comp["long_name"]
-            if "country" in comp["types"]:
-                c = comp["long_name"].upper()
-                record["COUNTRY"] = STANDARD_COUNTRIES.get(c, c)
-
-        time.sleep(REQUEST_DELAY)
+        _apply_maps_components(record, data["results"][0]["address_components"])
 
     except Exception:
         pass
 
     return record
 
+async def _fetch_raw(sem, session, site: str) -> str:
+    async with sem:
+        html = await _fetch_html(session, site)
+        return _address_from_html(html) if html else ""
+
+def standardize_series(raw: pd.Series) -> pd.Series:
+    """Standardize a whole column of raw address strings at once.
+
+    Punctuation strip, whitespace collapse and the abbreviation
+    alternation run as pandas C-level string kernels instead of one
+    Python call per row. Transliteration must stay unidecode: an
+    ascii-ignore stand-in would drop non-Latin scripts outright,
+    turning a Cyrillic or CJK street line into digits — so only the
+    rows that actually contain non-ASCII pay the per-row call.
+    """
+    s = raw.fillna("").astype("string")
+    non_ascii = s.str.contains(r"[^\x00-\x7f]", regex=True).fillna(False)
+    if non_ascii.any():
+        s[non_ascii] = s[non_ascii].map(unidecode)
+    s = s.str.upper()
+    s = s.str.replace(r"[^\w\s]", "", regex=True)
+    s = s.str.replace(r"\s+", " ", regex=True).str.strip()
+    s = s.str.replace(_SHORT_RE, lambda m: SHORT_FORMS[m.group(1)], regex=True)
+    return s.fillna("")
+
+async def _enrich_one(sem, rec: dict, on_done) -> dict:
+    async with sem:
+        rec = await enrich_google_maps_async(rec)
+        on_done()
+        return rec
+
+
+_CONFIDENCE_COLS = ["STREET ADDRESS 1", "CITY", "STATE", "PIN CODE", "COUNTRY"]
+_CONFIDENCE_WEIGHTS = np.array([40, 15, 15, 15, 15], dtype=np.int16)
+
+
+def score_confidence(records: list) -> None:
+    """Fill CONFIDENCE SCORE for every record in one vectorized pass.
+
+    The five presence checks become a boolean matrix dotted with the
+    weight vector — one C-level matmul instead of five interpreter
+    branches per record.
+    """
+    if not records:
+        return
+    present = pd.DataFrame(records)[_CONFIDENCE_COLS].fillna("").ne("").to_numpy()
+    scores = np.minimum(present @ _CONFIDENCE_WEIGHTS, 100)
+    for rec, s in zip(records, scores):
+        rec["CONFIDENCE SCORE"] = int(s)
+
+async def _process_batch(sites: list, on_done) -> list:
+    # One wave of concurrent fetches instead of N serial round trips
+    # (the semaphore keeps the crawl polite), then standardization runs
+    # vectorized over the whole column, then enrichment fans out. A
+    # ThreadPoolExecutor over the sync helpers would overlap the waits
+    # too, but coroutines get the same overlap without 10+ OS threads.
+    sem = asyncio.Semaphore(BATCH_CONCURRENCY)
+    async with aiohttp.ClientSession() as session:
+        # Company lists repeat domains (franchises, subsidiaries sharing
+        # a parent site); fetch each unique URL once, in upload order,
+        # then fan the result back out to every row that listed it.
+        unique_sites = list(dict.fromkeys(sites))
+        uniq_raws = await asyncio.gather(
+            *[_fetch_raw(sem, session, site) for site in unique_sites]
+        )
+        raw_by_site = dict(zip(unique_sites, uniq_raws))
+        raws = [raw_by_site[site] for site in sites]
+
+        stds = standardize_series(pd.Series(raws, dtype="string")).tolist()
+        recs = [
+            {
+                "STREET ADDRESS 1": std,
+                "STREET ADDRESS 2": "",
+                "CITY": "",
+                "STATE": "",
+                "PIN CODE": "",
+                "COUNTRY": "",
+                "DATA SOURCE LINK": site
+            }
+            for site, std in zip(sites, stds)
+        ]
+
+        out = list(await asyncio.gather(
+            *[_enrich_one(sem, rec, on_done) for rec in recs]
+        ))
+        score_confidence(out)
+        return out
+
 # -------------------------------------------------
-# CONFIDENCE SCORE
+# FILE LOADING
 # -------------------------------------------------
-def calculate_confidence(addr: dict) -> int:
-    score = 0
-
-    if addr["STREET ADDRESS 1"]:
-        score += 40
-    if addr["CITY"]:
-        score += 15
-    if addr["STATE"]:
-        score += 15
-    if addr["PIN CODE"]:
-        score += 15
-    if addr["COUNTRY"]:
-        score += 15
-
-    return min(score, 100)
+@st.cache_data(show_spinner=False)
+def load_companies(file_bytes: bytes, name: str) -> pd.DataFrame:
+    """Parse the uploaded file once per content hash.
+
+    st.cache_data keys on the raw bytes, so widget interactions and
+    reruns stop re-paying the parse. calamine reads xlsx several times
+    faster than the DOM-building default engine.
+    """
+    if name.lower().endswith(".csv"):
+        return pd.read_csv(BytesIO(file_bytes))
+    try:
+        return pd.read_excel(BytesIO(file_bytes), engine="calamine")
+    except ImportError:
+        # openpyxl read_only streams rows instead of materializing cell
+        # objects for the whole sheet — roughly an order of magnitude
+        # less memory on large uploads than the default reader.
+        from openpyxl import load_workbook
+
+        wb = load_workbook(BytesIO(file_bytes), read_only=True, data_only=True)
+        it = wb.active.iter_rows(values_only=True)
+        headers = next(it, ())
+        return pd.DataFrame(it, columns=list(headers))
 
 # -------------------------------------------------
 # EXCEL EXPORT
 # -------------------------------------------------
-def generate_excel(data: list) -> bytes:
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "SiteIntel Output"
-
-    ws.merge_cells("A1:J1")
-    ws["A1"] = "SiteIntel – By Kishor"
-    ws["A1"].font = Font(size=16, bold=True)
-    ws["A1"].alignment = Alignment(horizontal="center")
+# Above this row count the per-cell library overhead dominates; the raw
+# XML emitter below skips it entirely.
+FAST_EXPORT_THRESHOLD = 10_000
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+
+_XLSX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="SiteIntel Output" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+def generate_excel_fast(data: list, headers: list):
+    """Emit a minimal .xlsx directly: inline strings, no styles, no shared
+    strings table. Skips all per-cell library object construction."""
+    out = SpooledTemporaryFile(max_size=8 * 1024 * 1024, mode="w+b")
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _XLSX_CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _XLSX_RELS)
+        zf.writestr("xl/workbook.xml", _XLSX_WORKBOOK)
+        zf.writestr("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS)
+
+        sheet = StringIO()
+        sheet.write(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<sheetData>'
+        )
 
+        def write_row(values):
+            sheet.write('<row>')
+            for v in values:
+                sheet.write(f'<c t="inlineStr"><is><t>{escape(str(v))}</t></is></c>')
+            sheet.write('</row>')
+
+        write_row(headers)
+        getter = operator.itemgetter(*headers)
+        for rec in data:
+            try:
+                write_row(getter(rec))
+            except KeyError:
+                write_row([rec.get(h, "") for h in headers])
+
+        sheet.write('</sheetData></worksheet>')
+        zf.writestr("xl/worksheets/sheet1.xml", sheet.getvalue())
+    out.seek(0)
+    return out
+
+def generate_excel(data: list):
     headers = [
         "STREET ADDRESS 1", "STREET ADDRESS 2",
         "CITY", "STATE", "PIN CODE", "COUNTRY",
@@ -171,32 +469,99 @@ def generate_excel(data: list) -> bytes:
         "MASTER RECORD ID", "DATA SOURCE LINK"
     ]
 
-    ws.append(headers)
-
-    for c in ws[2]:
-        c.font = Font(bold=True)
-
+    if len(data) > FAST_EXPORT_THRESHOLD:
+        return generate_excel_fast(data, headers)
+
+    # Track column widths while building rows — one pass over the data,
+    # O(1) state per column — instead of a fixed width or a second
+    # full-sheet walk (impossible in write-only mode anyway).
+    # itemgetter resolves all columns in one C call per record instead of
+    # a Python-level .get loop; partial records fall back to the comp.
+    getter = operator.itemgetter(*headers)
+    rows = []
+    col_widths = [len(h) for h in headers]
     for r in data:
-        ws.append([r.get(h, "") for h in headers])
-
-    table = Table(
-        displayName="AddressTable",
-        ref=f"A2:J{len(data)+2}"
-    )
-    table.tableStyleInfo = TableStyleInfo(
-        name="TableStyleMedium9",
-        showRowStripes=True
-    )
-    ws.add_table(table)
-
-    for col in range(1, 11):
-        ws.column_dimensions[get_column_letter(col)].width = 25
-
-    ws.freeze_panes = "A3"
-
-    out = BytesIO()
-    wb.save(out)
-    return out.getvalue()
+        try:
+            row = getter(r)
+        except KeyError:
+            row = [r.get(h, "") for h in headers]
+        for i, v in enumerate(row):
+            w = len(str(v))
+            if w > col_widths[i]:
+                col_widths[i] = w
+        rows.append(row)
+
+    # constant_memory flushes each finished row to the zip immediately, so
+    # peak RAM is a single row no matter how large the batch gets. Rows
+    # must be written strictly top-to-bottom (already true here). Tables
+    # are not supported in this mode, so the header gets an autofilter.
+    # Spooled buffer: small exports stay in RAM, big ones spill to disk,
+    # and returning the file-like (download_button accepts one) avoids the
+    # full getvalue() copy of the payload.
+    out = SpooledTemporaryFile(max_size=8 * 1024 * 1024, mode="w+b")
+    wb = xlsxwriter.Workbook(out, {"constant_memory": True})
+    ws = wb.add_worksheet("SiteIntel Output")
+
+    title_fmt = wb.add_format({"bold": True, "font_size": 16, "align": "center"})
+    bold_fmt = wb.add_format({"bold": True})
+
+    for i, w in enumerate(col_widths):
+        ws.set_column(i, i, min(max(w + 2, 10), 50))
+
+    ws.freeze_panes(2, 0)
+
+    ws.merge_range("A1:J1", "SiteIntel – By Kishor", title_fmt)
+    ws.write_row(1, 0, headers, bold_fmt)
+
+    for idx, row in enumerate(rows, start=2):
+        ws.write_row(idx, 0, row)
+
+    ws.autofilter(1, 0, len(rows) + 1, len(headers) - 1)
+
+    # Row stripes via a conditional format: emitted once at save time as
+    # sheet metadata, so it costs nothing per row (a table style would,
+    # and tables are unavailable in constant_memory mode anyway).
+    stripe_fmt = wb.add_format({"bg_color": "#F2F2F2"})
+    ws.conditional_format(2, 0, len(rows) + 1, len(headers) - 1,
+                          {"type": "formula", "criteria": "=MOD(ROW(),2)=0",
+                           "format": stripe_fmt})
+
+    wb.close()
+    out.seek(0)
+    return out
+
+# xlsx stops being the right container well before its ~1M row cap:
+# files balloon past 100MB and even the raw-XML writer is per-cell
+# work. Past this count a columnar Parquet download is offered too.
+PARQUET_THRESHOLD = 50_000
+
+
+def generate_parquet(data: list) -> bytes:
+    buf = BytesIO()
+    pd.DataFrame(data).to_parquet(buf, engine="pyarrow", compression="zstd")
+    return buf.getvalue()
+
+# Past this count a single sheet is unwieldy to open and edges toward
+# the xlsx ~1M row cap, so the Excel download becomes a ZIP of
+# fixed-size parts instead. Each part reuses the normal export path.
+SPLIT_THRESHOLD = 250_000
+
+
+def generate_excel_zip(data: list):
+    out = SpooledTemporaryFile(max_size=8 * 1024 * 1024, mode="w+b")
+    # Parts are already deflated xlsx containers; ZIP_STORED skips
+    # recompressing them for nothing.
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_STORED) as zf:
+        for k, start in enumerate(range(0, len(data), SPLIT_THRESHOLD), start=1):
+            part = generate_excel(data[start:start + SPLIT_THRESHOLD])
+            # Stream the part buffer into the archive entry chunk by
+            # chunk rather than reading it back into one bytes object.
+            with zf.open(f"siteintel_part_{k}.xlsx", "w") as entry:
+                while chunk := part.read(64 * 1024):
+                    entry.write(chunk)
+            part.close()
+    out.seek(0)
+    return out
 
 # -------------------------------------------------
 # STREAMLIT UI
@@ -213,7 +578,7 @@ if st.button("🚀 Process"):
         st.warning("Upload a file first.")
         st.stop()
 
-    df = pd.read_excel(uploaded)
+    df = load_companies(uploaded.getvalue(), uploaded.name)
 
     url_col = next(
         (c for c in df.columns if df[c].astype(str).str.startswith("http").any()),
@@ -225,26 +590,23 @@ if st.button("🚀 Process"):
         st.stop()
 
     progress = st.progress(0)
-    records = []
-    seen = {}
+    sites = df[url_col].astype(str).tolist()
 
-    for i, site in enumerate(df[url_col].astype(str)):
-        raw = extract_address(site)
-        std = standardize_address(raw)
+    # Each progress call is a frontend message roundtrip; at thousands
+    # of rows that serializes the loop, so only push an update when the
+    # displayed percent actually changes.
+    completed = {"count": 0, "pct": -1}
+    def _on_site_done():
+        completed["count"] += 1
+        pct = int(100 * completed["count"] / max(1, len(sites)))
+        if pct != completed["pct"]:
+            completed["pct"] = pct
+            progress.progress(pct / 100)
 
-        rec = {
-            "STREET ADDRESS 1": std,
-            "STREET ADDRESS 2": "",
-            "CITY": "",
-            "STATE": "",
-            "PIN CODE": "",
-            "COUNTRY": "",
-            "DATA SOURCE LINK": site
-        }
-
-        rec = enrich_google_maps(rec)
-        rec["CONFIDENCE SCORE"] = calculate_confidence(rec)
+    records = asyncio.run(_process_batch(sites, _on_site_done))
 
+    seen = {}
+    for rec in records:
         h = hash_address(rec)
         if h in seen:
             rec["DUPLICATE FLAG"] = "YES"
@@ -254,16 +616,29 @@ if st.button("🚀 Process"):
             rec["MASTER RECORD ID"] = h[:8]
             seen[h] = h[:8]
 
-        records.append(rec)
-        progress.progress((i + 1) / len(df))
-
     st.success(f"Processed {len(records)} records")
 
     st.dataframe(pd.DataFrame(records), use_container_width=True)
 
-    st.download_button(
-        "📥 Download Excel",
-        generate_excel(records),
-        "siteintel_output.xlsx",
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+    if len(records) > SPLIT_THRESHOLD:
+        st.download_button(
+            "📥 Download Excel (ZIP of parts)",
+            generate_excel_zip(records),
+            "siteintel_output.zip",
+            "application/zip"
+        )
+    else:
+        st.download_button(
+            "📥 Download Excel",
+            generate_excel(records),
+            "siteintel_output.xlsx",
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+
+    if len(records) > PARQUET_THRESHOLD:
+        st.download_button(
+            "📥 Download Parquet (faster for large results)",
+            generate_parquet(records),
+            "siteintel_output.parquet",
+            "application/octet-stream"
+        )